@@ -1,13 +1,6 @@
 import streamlit as st
-from chat_cli import (
-    SymptomRetrievalModel,
-    SymptomSeverityChecker,
-    FAQChatbot,
-    extract_symptoms_from_sentence,
-    get_followup_questions
-)
-import io
-import sys
+from turn_orchestrator import run_turn
+from readiness import warmup, get_component
 
 # Set page config
 st.set_page_config(
@@ -16,16 +9,29 @@ st.set_page_config(
     layout="wide"
 )
 
+CONFIDENCE_COLORS = {
+    "Very High": "red",
+    "High": "orange",
+    "Moderate": "yellow",
+    "Low": "green"
+}
+
 # Initialize models
+# Shared by every session. The models are read-only after loading and
+# turn_orchestrator bounds how many model calls run at once, so sessions
+# don't queue behind a single lock.
 @st.cache_resource
 def load_models():
+    warmup()
     return {
-        'retriever': SymptomRetrievalModel(cache_embeddings=False),
-        'severity_checker': SymptomSeverityChecker(),
-        'faq_model': FAQChatbot("data/faq_dataset.csv")
+        'retriever': get_component('retriever'),
+        'severity_checker': get_component('severity_checker'),
+        'faq_model': get_component('faq_model')
     }
 
 # Initialize session state
+# Assistant messages keep the structured turn result, so reruns (sidebar
+# clicks, "Clear Symptoms") only re-render and never recompute.
 if 'messages' not in st.session_state:
     st.session_state.messages = []
 if 'session_symptoms' not in st.session_state:
@@ -33,79 +39,61 @@ if 'session_symptoms' not in st.session_state:
 if 'asked_followups_for' not in st.session_state:
     st.session_state.asked_followups_for = set()
 
-def capture_output(func, *args, **kwargs):
-    """Capture print output from a function"""
-    old_stdout = sys.stdout
-    new_stdout = io.StringIO()
-    sys.stdout = new_stdout
-    
-    try:
-        func(*args, **kwargs)
-        output = new_stdout.getvalue()
-    finally:
-        sys.stdout = old_stdout
-    
-    return output
-
 def process_user_input(prompt, models):
-    # Extract new symptoms
-    new_symptoms = set(extract_symptoms_from_sentence(prompt, models['retriever'].symptom_vocab_list))
-    
-    if new_symptoms:
+    # Extraction runs alongside a speculative FAQ encode; predictions,
+    # severity and followups are computed concurrently once symptoms are known
+    turn = run_turn(
+        prompt,
+        st.session_state.session_symptoms,
+        st.session_state.asked_followups_for,
+        models['retriever'],
+        models['severity_checker'],
+        models['faq_model']
+    )
+
+    if turn["kind"] == "symptoms":
         # Add new symptoms to session
-        st.session_state.session_symptoms.update(new_symptoms)
-        st.markdown(f"I've noted these new symptoms: {', '.join(new_symptoms)}")
-        
-        # Get disease predictions
-        symptom_list_str = ", ".join(st.session_state.session_symptoms)
-        disease_results = models['retriever'].get_disease_predictions(symptom_list_str)
-        
-        if disease_results:
+        st.session_state.session_symptoms.update(turn["new_symptoms"])
+        st.session_state.asked_followups_for.update(turn["new_symptoms"])
+    return turn
+
+def render_turn(turn):
+    if turn["kind"] == "symptoms":
+        st.markdown(f"I've noted these new symptoms: {', '.join(turn['new_symptoms'])}")
+
+        # Disease predictions
+        if turn["disease_results"]:
             st.markdown("**Current Predicted Conditions:**")
-            for res in disease_results:
-                confidence_color = {
-                    "Very High": "red",
-                    "High": "orange",
-                    "Moderate": "yellow",
-                    "Low": "green"
-                }[res['confidence_level']]
-                
+            for res in turn["disease_results"]:
+                confidence_color = CONFIDENCE_COLORS[res['confidence_level']]
                 st.markdown(f"""
                 • **{res['disease']}**
                   - Matched with: {res['matched_symptom']}
                   - Confidence: <span style='color:{confidence_color}'>{res['confidence']}% ({res['confidence_level']})</span>
                 """, unsafe_allow_html=True)
-        
-        # Get severity assessment
-        if st.session_state.session_symptoms:
-            severity_results = models['severity_checker'].classify_severity(symptom_list_str)
-            st.markdown("**Severity Assessment:**")
-            for sres in severity_results:
-                st.markdown(f"""
-                • {sres['symptom']}: {sres['severity'].capitalize()}
-                  → {sres['alert']}
-                """)
-        
-        # Get follow-up questions for new symptoms
-        for symptom in new_symptoms:
-            if symptom not in st.session_state.asked_followups_for:
-                followups = get_followup_questions(symptom)
-                if followups:
-                    st.markdown(f"**Follow-up questions for '{symptom}':**")
-                    for i, q in enumerate(followups, 1):
-                        st.markdown(f"{i}. {q}")
-                st.session_state.asked_followups_for.add(symptom)
+
+        # Severity assessment
+        if turn["severity_results"]:
+            overall = turn["overall_severity"]["severity"].capitalize()
+            st.markdown(f"**Severity Assessment** (overall: {overall}):")
+            for sres in turn["severity_results"]:
+                st.markdown(sres["severity_markdown"])
+
+        # Follow-up questions for new symptoms
+        for row in turn["followup_rows"].values():
+            if row["followups"]:
+                for line in row["followup_markdown_lines"]:
+                    st.markdown(line)
     else:
         # Handle as FAQ
-        faq_res = models['faq_model'].get_best_match(prompt, top_k=1)
-        if faq_res and faq_res[0]["score"] > 0.5:
-            st.markdown(faq_res[0]["answer"])
+        if turn["faq_answer"]:
+            st.markdown(turn["faq_answer"])
         else:
             st.markdown("I'm not sure about that. Could you please describe your symptoms or rephrase your question?")
-    
+
     # Add medical disclaimer
     st.warning("""
-    ⚠️ **Medical Disclaimer**: This is an AI-powered tool for informational purposes only. 
+    ⚠️ **Medical Disclaimer**: This is an AI-powered tool for informational purposes only.
     It should not be used as a substitute for professional medical advice, diagnosis, or treatment.
     Always seek the advice of your physician or other qualified health provider.
     """)
@@ -116,27 +104,35 @@ def main():
     Welcome! Please describe your symptoms or ask any health-related questions.
     I'll help assess your symptoms and suggest possible conditions.
     """)
-    
+
     # Load models
     models = load_models()
-    
-    # Display chat messages
+    if not models['faq_model'].available:
+        st.info(f"FAQ answers are unavailable: {models['faq_model'].unavailable_reason}. "
+                "Run `python build_faq_index.py` to rebuild the index.")
+
+    # Display chat messages from the cached results
     for message in st.session_state.messages:
         with st.chat_message(message["role"]):
-            st.markdown(message["content"])
-    
+            if message["role"] == "assistant":
+                render_turn(message["turn"])
+            else:
+                st.markdown(message["content"])
+
     # Chat input
     if prompt := st.chat_input("Describe your symptoms or ask a question..."):
         # Add user message to chat history
         st.session_state.messages.append({"role": "user", "content": prompt})
         with st.chat_message("user"):
             st.markdown(prompt)
-        
-        # Process input using chat_cli's functionality
+
+        # The only place model work happens: once per submitted message
         with st.chat_message("assistant"):
             with st.spinner("Processing..."):
-                process_user_input(prompt, models)
-    
+                turn = process_user_input(prompt, models)
+            st.session_state.messages.append({"role": "assistant", "turn": turn})
+            render_turn(turn)
+
     # Show current symptoms in sidebar
     with st.sidebar:
         st.subheader("Current Symptoms")
@@ -151,4 +147,4 @@ def main():
             st.write("No symptoms recorded yet.")
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    main()
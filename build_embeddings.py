@@ -0,0 +1,170 @@
+# build_embeddings.py
+#
+# Offline embedding builder for large symptom vocabularies and FAQ corpora.
+#   - texts are sorted by length so each batch pads to a similar size
+#   - sorted texts are cut into shards and encoded by a pool of CPU processes,
+#     each loading its own encoder with a share of the torch threads
+#   - every finished shard is checkpointed to disk, so an interrupted build
+#     resumes where it stopped (the checkpoint dir is keyed by model, shard
+#     size and texts, and each shard records the rows it holds)
+#   - output is the format the runtime loads: data/symptom_embeddings_<backend>.pkl for
+#     SymptomRetrievalModel, data/faq_index/ for FAQChatbot
+#
+#   python build_embeddings.py symptoms [--workers 4] [--batch-size 64]
+#   python build_embeddings.py faq [--csv data/faq_dataset.csv] [--index data/faq_index]
+
+import argparse
+import hashlib
+import os
+import pickle
+import time
+import numpy as np
+
+from embedding_backend import load_encoder, get_encoder_key, texts_digest
+
+CHECKPOINT_ROOT = "data/.embedding_checkpoints"
+DEFAULT_BATCH_SIZE = 64
+DEFAULT_SHARD_SIZE = 2048
+
+_worker_encoder = None
+
+
+def _init_worker(torch_threads):
+    global _worker_encoder
+    import torch
+    # Without this every process would grab all cores and they'd fight
+    torch.set_num_threads(torch_threads)
+    _worker_encoder = load_encoder()
+
+
+def _encode_shard(texts, ids, batch_size, out_path):
+    encoder = _worker_encoder or load_encoder()
+    embeddings = np.asarray(encoder.encode(texts, batch_size=batch_size, convert_to_numpy=True), dtype=np.float32)
+    # The row ids go in with the vectors so a resume can check the shard still
+    # covers the same texts. Write then rename so a half-written shard is
+    # never mistaken for a checkpoint.
+    tmp = out_path + ".tmp.npz"
+    np.savez(tmp, ids=np.asarray(ids, dtype=np.int64), embeddings=embeddings)
+    os.replace(tmp, out_path)
+    return len(texts)
+
+
+def _load_shard(path, ids):
+    # None when the checkpoint is missing or was cut for a different slice
+    if not os.path.exists(path):
+        return None
+    with np.load(path) as shard:
+        if not np.array_equal(shard["ids"], ids):
+            return None
+        return shard["embeddings"]
+
+
+def _checkpoint_dir(texts, shard_size):
+    key = f"{get_encoder_key()}:{shard_size}:{texts_digest(texts)}"
+    return os.path.join(CHECKPOINT_ROOT, hashlib.sha1(key.encode("utf-8")).hexdigest()[:16])
+
+
+def encode_parallel(texts, workers=None, batch_size=DEFAULT_BATCH_SIZE,
+                    shard_size=DEFAULT_SHARD_SIZE, checkpoint_dir=None):
+    """
+    Encode `texts` and return a float32 array in the original order.
+    Finished shards are kept in `checkpoint_dir` until the whole run succeeds;
+    then only those shard files are deleted.
+    """
+    texts = [str(t) for t in texts]
+    if not texts:
+        return np.empty((0, 0), dtype=np.float32)
+
+    workers = workers or max(1, min(os.cpu_count() or 1, 4))
+    derived_dir = checkpoint_dir is None
+    checkpoint_dir = checkpoint_dir or _checkpoint_dir(texts, shard_size)
+    os.makedirs(checkpoint_dir, exist_ok=True)
+
+    order = sorted(range(len(texts)), key=lambda i: len(texts[i]))
+    shards = [order[start:start + shard_size] for start in range(0, len(order), shard_size)]
+    paths = [os.path.join(checkpoint_dir, f"shard_{k:05d}.npz") for k in range(len(shards))]
+
+    pending = [k for k, path in enumerate(paths) if _load_shard(path, shards[k]) is None]
+    done_texts = len(texts) - sum(len(shards[k]) for k in pending)
+    if done_texts:
+        print(f"Resuming: {len(shards) - len(pending)}/{len(shards)} shards already in {checkpoint_dir}")
+
+    start_time = time.perf_counter()
+
+    def report(done_shards):
+        elapsed = time.perf_counter() - start_time
+        print(f"  [{done_shards}/{len(shards)} shards] {done_texts}/{len(texts)} texts, {elapsed:.1f}s", flush=True)
+
+    if workers == 1 or len(pending) <= 1:
+        for n, k in enumerate(pending, 1):
+            done_texts += _encode_shard([texts[i] for i in shards[k]], shards[k], batch_size, paths[k])
+            report(len(shards) - len(pending) + n)
+    else:
+        import multiprocessing
+        from concurrent.futures import ProcessPoolExecutor, as_completed
+
+        torch_threads = max(1, (os.cpu_count() or 1) // workers)
+        # spawn: forking a process that already initialized torch is unsafe
+        with ProcessPoolExecutor(max_workers=workers,
+                                 mp_context=multiprocessing.get_context("spawn"),
+                                 initializer=_init_worker, initargs=(torch_threads,)) as pool:
+            futures = [pool.submit(_encode_shard, [texts[i] for i in shards[k]], shards[k], batch_size, paths[k])
+                       for k in pending]
+            for n, future in enumerate(as_completed(futures), 1):
+                done_texts += future.result()
+                report(len(shards) - len(pending) + n)
+
+    result = None
+    for shard, path in zip(shards, paths):
+        embeddings = _load_shard(path, shard)
+        if result is None:
+            result = np.empty((len(texts), embeddings.shape[1]), dtype=np.float32)
+        result[shard] = embeddings
+
+    # Only remove what this run wrote: a caller-supplied directory may hold
+    # anything else
+    for path in paths:
+        os.remove(path)
+    if derived_dir:
+        try:
+            os.rmdir(checkpoint_dir)
+        except OSError:
+            pass
+    return result
+
+
+def build_symptom_embeddings(data_path="data/cleaned_symptom_disease.csv", cache_path=None, **kwargs):
+    import pandas as pd
+    from sympton_retrieval import symptom_cache_path
+
+    cache_path = cache_path or symptom_cache_path()
+
+    # Same order as SymptomRetrievalModel.unique_symptoms
+    df = pd.read_csv(data_path).drop_duplicates(subset=['Symptom', 'Disease'])
+    unique_symptoms = df['Symptom'].unique().tolist()
+
+    embeddings = encode_parallel(unique_symptoms, **kwargs)
+    with open(cache_path, "wb") as f:
+        pickle.dump({"model": get_encoder_key(), "texts": texts_digest(unique_symptoms),
+                     "embeddings": embeddings}, f)
+    print(f"✅ Saved {cache_path}: {embeddings.shape[0]} symptoms x {embeddings.shape[1]} dims.")
+    return embeddings
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Precompute embedding caches offline.")
+    parser.add_argument("target", choices=["symptoms", "faq"])
+    parser.add_argument("--workers", type=int, default=None, help="encoder processes (default: up to 4)")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument("--shard-size", type=int, default=DEFAULT_SHARD_SIZE,
+                        help="texts per checkpointed shard")
+    parser.add_argument("--csv", default="data/faq_dataset.csv")
+    parser.add_argument("--index", default="data/faq_index")
+    args = parser.parse_args()
+
+    options = {"workers": args.workers, "batch_size": args.batch_size, "shard_size": args.shard_size}
+    if args.target == "symptoms":
+        build_symptom_embeddings(**options)
+    else:
+        from build_faq_index import build_faq_index
+        build_faq_index(args.csv, args.index, **options)
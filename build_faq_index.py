@@ -0,0 +1,73 @@
+# build_faq_index.py
+#
+# Offline builder for the FAQ index FAQChatbot loads at startup. Re-running it
+# after editing the CSV only encodes the question/answer pairs that are new or
+# changed; everything else is reused from the existing index. For large
+# corpora use `python build_embeddings.py faq --workers N` to encode in parallel.
+#
+#   python build_faq_index.py [faq_csv] [index_dir]
+
+import sys
+import numpy as np
+
+from build_embeddings import encode_parallel
+from embedding_backend import get_encoder_key
+from embedding_store import normalize_rows
+from faq_index import (DEFAULT_INDEX_PATH, FAQIndex, content_hash, faq_index_exists,
+                       pair_hash, write_faq_index)
+
+DEFAULT_CSV_PATH = "data/faq_dataset.csv"
+
+
+def load_faq_pairs(csv_path):
+    import pandas as pd
+
+    df = pd.read_csv(csv_path).dropna(subset=["Question", "Answer"])
+    return df["Question"].astype(str).tolist(), df["Answer"].astype(str).tolist()
+
+
+def build_faq_index(csv_path=DEFAULT_CSV_PATH, index_path=DEFAULT_INDEX_PATH, workers=1, **encode_options):
+    questions, answers = load_faq_pairs(csv_path)
+    hashes = [pair_hash(q, a) for q, a in zip(questions, answers)]
+    model_name = get_encoder_key()
+
+    # Reuse embeddings from the previous index when it was built by the same model
+    reusable = {}
+    if faq_index_exists(index_path):
+        old = FAQIndex(index_path)
+        if old.meta["model"] == model_name:
+            if old.meta["content_hash"] == content_hash(hashes):
+                print(f"✅ FAQ index at {index_path} is already up to date ({len(old)} pairs).")
+                return old.meta
+            for row, h in enumerate(old.hashes):
+                reusable[h.decode("ascii")] = row
+        old_embeddings = old.embeddings
+
+    to_encode = [i for i, h in enumerate(hashes) if h not in reusable]
+    embeddings = None
+    if to_encode:
+        # Sorted, sharded and checkpointed; see build_embeddings.py
+        new_embeddings = normalize_rows(encode_parallel(
+            [questions[i] for i in to_encode], workers=workers, **encode_options
+        ))
+        embeddings = np.empty((len(questions), new_embeddings.shape[1]), dtype=np.float32)
+        embeddings[to_encode] = new_embeddings
+    elif questions:
+        embeddings = np.empty((len(questions), old_embeddings.shape[1]), dtype=np.float32)
+    else:
+        embeddings = np.empty((0, 0), dtype=np.float32)
+
+    for i, h in enumerate(hashes):
+        if h in reusable:
+            embeddings[i] = old_embeddings[reusable[h]]
+
+    meta = write_faq_index(index_path, questions, answers, hashes, embeddings, model_name)
+    print(f"✅ FAQ index written to {index_path}: {meta['count']} pairs, "
+          f"{len(to_encode)} encoded, {meta['count'] - len(to_encode)} reused.")
+    return meta
+
+
+if __name__ == "__main__":
+    csv_path = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_CSV_PATH
+    index_path = sys.argv[2] if len(sys.argv) > 2 else DEFAULT_INDEX_PATH
+    build_faq_index(csv_path, index_path)
@@ -1,14 +1,18 @@
-from sympton_retrieval import SymptomRetrievalModel
-from symptom_severity_checker import SymptomSeverityChecker
-from followup import get_followup_questions
 from symptom_utils import extract_symptoms_from_sentence
-from faq_chatbot import FAQChatbot
+from turn_orchestrator import run_turn, run_analysis
+from readiness import warmup, get_component
 
 
 def main():
-    retriever = SymptomRetrievalModel(cache_embeddings=False)
-    severity_checker = SymptomSeverityChecker()
-    faq_model = FAQChatbot("data/faq_dataset.csv")
+    # Loads every component once and runs a dummy query so the first real
+    # turn doesn't pay the lazy-init cost
+    warmup()
+    retriever = get_component("retriever")
+    severity_checker = get_component("severity_checker")
+    faq_model = get_component("faq_model")
+    if not faq_model.available:
+        print(f"Note: {faq_model.unavailable_reason}, health questions can't be answered.")
+        print("Rebuild it with: python build_faq_index.py\n")
 
     print("Symptom Checker Chatbot (CLI Mode)")
     print("Type 'exit' to quit\n")
@@ -28,10 +32,20 @@ def main():
         if user_input.lower() in ['exit', 'quit']:
             break
 
-        # (A) Detect new symptoms
-        new_symptoms = set(extract_symptoms_from_sentence(user_input, retriever.symptom_vocab_list))
+        # Extraction, the speculative FAQ encode and the diagnosis lookups
+        # all run concurrently inside run_turn
+        turn = run_turn(
+            user_input,
+            session_symptoms,
+            asked_followups_for,
+            retriever,
+            severity_checker,
+            faq_model
+        )
 
-        if new_symptoms:
+        # (A) Detect new symptoms
+        if turn["kind"] == "symptoms":
+            new_symptoms = turn["new_symptoms"]
             session_symptoms |= new_symptoms
             print(f"\n [User Provided New Symptoms] => {new_symptoms}")
             print(f" Current All Symptoms: {session_symptoms}")
@@ -41,19 +55,14 @@ def main():
                 asked_followups_for,
                 retriever,
                 severity_checker,
-                faq_model
+                faq_model,
+                analysis=turn
             )
             continue
 
         # (B) No new symptoms found → clarify intent
-        user_question = user_input.lower()
-        is_question = (
-            "?" in user_question or
-            user_question.startswith(("what", "how", "can", "should", "is", "do", "does", "will", "could"))
-        )
-
-        if is_question:
-            handle_faq_query(faq_model, user_input)
+        if turn["kind"] == "faq":
+            handle_faq_query(turn)
             continue
 
         print("\n I didn’t detect any new symptoms.")
@@ -68,7 +77,8 @@ def main():
             print("\nYou can now enter the symptom you'd like to add.")
             continue
         elif followup_choice.startswith("question"):
-            handle_faq_query(faq_model, user_input)
+            # The FAQ match was already computed alongside extraction
+            handle_faq_query(turn)
             continue
         else:
             print("\n Continuing with current symptoms...")
@@ -87,11 +97,19 @@ def run_diagnosis_and_followups(
     asked_followups_for: set,
     retriever,
     severity_checker,
-    faq_model
+    faq_model,
+    analysis=None
 ) -> str:
     while True:
-        symptom_list_str = ", ".join(session_symptoms)
-        disease_results = retriever.get_disease_predictions(symptom_list_str)
+        unasked_symptoms = [s for s in session_symptoms if s not in asked_followups_for]
+        if analysis is None:
+            # Predictions, severity and followup lookups are independent
+            analysis = run_analysis(session_symptoms, retriever, severity_checker, unasked_symptoms)
+        disease_results = analysis["disease_results"]
+        severity_results = analysis["severity_results"]
+        overall_severity = analysis["overall_severity"]
+        analysis = None
+
         if not disease_results:
             print("\n No disease predictions found.")
         else:
@@ -103,29 +121,23 @@ def run_diagnosis_and_followups(
                 )
 
         if session_symptoms:
-            severity_results = severity_checker.classify_severity(symptom_list_str)
-            print("\n Severity Assessment:")
+            print(f"\n Severity Assessment (overall: {overall_severity['severity'].capitalize()}):")
             for sres in severity_results:
-                print(
-                    f" - {sres['symptom']}: Severity={sres['severity'].capitalize()} → {sres['alert']}"
-                )
+                print(sres["severity_cli"])
         else:
             print("\n No known symptoms to assess severity.")
 
-        unasked_symptoms = [s for s in session_symptoms if s not in asked_followups_for]
         if not unasked_symptoms:
             break
 
         for symptom in unasked_symptoms:
-            followups = get_followup_questions(symptom)
+            response = severity_checker.responses.lookup(symptom)
             asked_followups_for.add(symptom)
 
-            if not followups:
+            if not response["followups"]:
                 continue
 
-            print(f"\nFollow-up questions for the newly mentioned symptom '{symptom}':")
-            for i, q in enumerate(followups, 1):
-                print(f"  {i}. {q}")
+            print("\n".join(response["followup_cli_lines"]))
 
             user_answer = input("\n Your answer to the above follow-up questions or please ask any other question you have: ").strip()
             if user_answer.lower() in ["exit", "quit"]:
@@ -147,10 +159,9 @@ def run_diagnosis_and_followups(
     return ""  # No ambiguous input to return
 
 
-def handle_faq_query(faq_model, user_input):
-    faq_res = faq_model.get_best_match(user_input, top_k=1)
-    if faq_res and faq_res[0]["score"] > 0.5:
-        print(f"\nChatbot (FAQ): {faq_res[0]['answer']}")
+def handle_faq_query(turn):
+    if turn["faq_answer"]:
+        print(f"\nChatbot (FAQ): {turn['faq_answer']}")
     else:
         print("\nChatbot (FAQ): I’m not sure how to answer that.")
         print("But here’s what I know based on your symptoms so far.")
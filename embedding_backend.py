@@ -0,0 +1,193 @@
+# embedding_backend.py
+#
+# Single place where the MiniLM sentence encoder gets loaded. The backend is
+# picked by configuration (environment variables) so CPU-only hosts can swap
+# the fp32 model for a quantized one without code changes:
+#
+#   WELLWISE_ENCODER_BACKEND  fp32 (default) | int8 | onnx
+#   WELLWISE_MODEL_PATH       local directory holding the saved model; when
+#                             set, nothing is fetched from the hub
+#   WELLWISE_OFFLINE          "1" to forbid any network access (use the
+#                             HuggingFace cache only)
+#   WELLWISE_ONNX_FILE        optional ONNX file inside the model dir, e.g.
+#                             onnx/model_qint8_avx512_vnni.onnx
+#
+# Run this file directly to compare a backend against fp32:
+#   python embedding_backend.py int8
+# Latency and peak RSS are measured for each backend in its own subprocess
+# (python embedding_backend.py --measure <backend>), so neither number
+# includes the other model.
+
+import os
+import threading
+import time
+from functools import lru_cache
+
+# The HF libraries read these when they are first imported, so they have to
+# be set before anything pulls in sentence_transformers / transformers
+if os.environ.get("WELLWISE_OFFLINE") == "1":
+    os.environ["HF_HUB_OFFLINE"] = "1"
+    os.environ["TRANSFORMERS_OFFLINE"] = "1"
+
+MODEL_NAME = "all-MiniLM-L6-v2"
+BACKENDS = ("fp32", "int8", "onnx")
+
+# lru_cache doesn't stop two threads loading the same model at once
+_load_lock = threading.Lock()
+
+
+def get_backend_name():
+    backend = os.environ.get("WELLWISE_ENCODER_BACKEND", "fp32").strip().lower()
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown encoder backend '{backend}', expected one of {BACKENDS}")
+    return backend
+
+
+def get_model_source():
+    return os.environ.get("WELLWISE_MODEL_PATH") or MODEL_NAME
+
+
+def get_encoder_key(backend=None):
+    # Identifies which model produced a set of vectors; caches and indexes
+    # store it and are rebuilt when it doesn't match the running encoder
+    return f"{get_model_source()}:{backend or get_backend_name()}"
+
+
+def texts_digest(texts):
+    # Order-sensitive hash of the texts a set of vectors was encoded from
+    import hashlib
+    digest = hashlib.sha1()
+    for text in texts:
+        digest.update(str(text).encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def load_encoder(backend=None):
+    # Every caller shares one encoder per backend instead of each model class
+    # holding its own copy of the weights
+    with _load_lock:
+        return _load_encoder(backend or get_backend_name(), get_model_source())
+
+
+@lru_cache(maxsize=None)
+def _load_encoder(backend, source):
+    import inspect
+    from sentence_transformers import SentenceTransformer
+
+    options = {"device": "cpu"}
+    # Belt and braces: the env vars above don't help if HF was already
+    # imported before this module
+    if (os.environ.get("WELLWISE_OFFLINE") == "1"
+            and "local_files_only" in inspect.signature(SentenceTransformer.__init__).parameters):
+        options["local_files_only"] = True
+
+    if backend == "onnx":
+        # Needs sentence-transformers>=3.2 and optimum[onnxruntime]
+        model_kwargs = {}
+        if os.environ.get("WELLWISE_ONNX_FILE"):
+            model_kwargs["file_name"] = os.environ["WELLWISE_ONNX_FILE"]
+        return SentenceTransformer(source, backend="onnx", model_kwargs=model_kwargs, **options)
+
+    model = SentenceTransformer(source, **options)
+    if backend == "int8":
+        import torch
+        # Dynamic quantization: Linear weights stored as int8, activations
+        # quantized on the fly. Most of MiniLM's compute is in these layers.
+        torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8, inplace=True)
+    return model
+
+
+def _normalize(vectors):
+    import numpy as np
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / np.maximum(norms, 1e-12)
+
+
+def check_parity(backend, texts, top_k=5):
+    """
+    Compare `backend` against the fp32 reference on `texts`.
+    Returns mean / min cosine between paired embeddings and the average
+    top-k neighbour overlap when each text is used as a query against the rest.
+    """
+    import numpy as np
+
+    reference = _normalize(load_encoder("fp32").encode(texts))
+    candidate_model = load_encoder(backend)
+
+    start = time.perf_counter()
+    candidate = _normalize(candidate_model.encode(texts))
+    candidate_time = time.perf_counter() - start
+
+    paired_cosine = np.sum(reference * candidate, axis=1)
+
+    def neighbours(embeddings):
+        sims = embeddings @ embeddings.T
+        np.fill_diagonal(sims, -np.inf)
+        return np.argsort(-sims, axis=1)[:, :top_k]
+
+    ref_nn, cand_nn = neighbours(reference), neighbours(candidate)
+    overlap = [len(set(r) & set(c)) / top_k for r, c in zip(ref_nn, cand_nn)]
+
+    return {
+        "backend": backend,
+        "texts": len(texts),
+        "mean_cosine": float(paired_cosine.mean()),
+        "min_cosine": float(paired_cosine.min()),
+        f"top{top_k}_overlap": float(np.mean(overlap)),
+        "encode_ms_per_text": candidate_time * 1000 / len(texts),
+    }
+
+
+def time_query_encode(backend, query="I have a headache and fever", repeats=20):
+    model = load_encoder(backend)
+    model.encode([query])  # first call pays lazy init
+    start = time.perf_counter()
+    for _ in range(repeats):
+        model.encode([query])
+    return (time.perf_counter() - start) * 1000 / repeats
+
+
+def measure_backend(backend):
+    # Only meaningful in a fresh process that loads nothing but this backend
+    import resource
+    query_ms = time_query_encode(backend)
+    # ru_maxrss is KiB on Linux
+    return {"query_ms": query_ms, "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024}
+
+
+def measure_in_subprocess(backend):
+    import json
+    import subprocess
+    import sys
+    out = subprocess.run([sys.executable, os.path.abspath(__file__), "--measure", backend],
+                         check=True, capture_output=True, text=True).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+########################### PARITY CHECK #####################################
+
+if __name__ == "__main__":
+    import sys
+
+    if len(sys.argv) > 2 and sys.argv[1] == "--measure":
+        import json
+        print(json.dumps(measure_backend(sys.argv[2])))
+        sys.exit(0)
+
+    import pandas as pd
+
+    backend = sys.argv[1] if len(sys.argv) > 1 else get_backend_name()
+    texts = pd.read_csv("data/symptom_vocabulary.csv")["Symptom"].tolist()
+
+    report = check_parity(backend, texts)
+    for name in dict.fromkeys(("fp32", backend)):
+        measured = measure_in_subprocess(name)
+        report[f"{name}_query_ms"] = measured["query_ms"]
+        report[f"{name}_peak_rss_mb"] = measured["peak_rss_mb"]
+
+    print("\n---------- Encoder Parity Report ------------")
+    for key, value in report.items():
+        print(f"{key}: {value:.4f}" if isinstance(value, float) else f"{key}: {value}")
+    print("==========================================\n")
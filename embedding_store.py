@@ -0,0 +1,189 @@
+# embedding_store.py
+#
+# Compact in-memory storage for the symptom / FAQ embedding matrices.
+# Vectors are L2-normalized once at build time so a cosine similarity is just
+# a dot product, which can be computed directly on the compact form.
+#
+#   WELLWISE_EMBEDDING_STORAGE  float32 (default) | float16 | int8
+#   WELLWISE_EMBEDDING_PCA_DIM  project to this many dims at build time (0 = off)
+#
+# Run this file directly for a memory vs ranking-agreement report:
+#   python embedding_store.py
+
+import os
+import numpy as np
+
+STORAGE_MODES = ("float32", "float16", "int8")
+CHUNK_ROWS = 4096   # rows upcast to float32 at a time when scoring
+
+
+def get_storage_mode():
+    mode = os.environ.get("WELLWISE_EMBEDDING_STORAGE", "float32").strip().lower()
+    if mode not in STORAGE_MODES:
+        raise ValueError(f"Unknown embedding storage '{mode}', expected one of {STORAGE_MODES}")
+    return mode
+
+
+def get_pca_dim():
+    return int(os.environ.get("WELLWISE_EMBEDDING_PCA_DIM", "0") or 0)
+
+
+def to_numpy(embeddings):
+    # Cached embeddings may be torch tensors (older pickles) or numpy arrays
+    if hasattr(embeddings, "cpu"):
+        embeddings = embeddings.cpu().numpy()
+    return np.asarray(embeddings, dtype=np.float32)
+
+
+def normalize_rows(x):
+    norms = np.linalg.norm(x, axis=1, keepdims=True)
+    return x / np.maximum(norms, 1e-12)
+
+
+class CompactEmbeddings:
+    def __init__(self, data, mode="float32", scale=None, pca_mean=None, pca_components=None):
+        self.data = data                        # (n, d) float32 / float16 / int8
+        self.mode = mode
+        self.scale = scale                      # (n,) float32, int8 mode only
+        self.pca_mean = pca_mean                # (D,) float32 or None
+        self.pca_components = pca_components    # (d, D) float32 or None
+
+    @classmethod
+    def build(cls, embeddings, mode=None, pca_dim=None, normalized=False):
+        mode = mode or get_storage_mode()
+        if mode not in STORAGE_MODES:
+            raise ValueError(f"Unknown embedding storage '{mode}', expected one of {STORAGE_MODES}")
+        pca_dim = get_pca_dim() if pca_dim is None else pca_dim
+
+        x = to_numpy(embeddings)
+        if normalized and mode == "float32" and not pca_dim:
+            # Already in the stored form (e.g. a memory-mapped index): wrap
+            # it without copying
+            return cls(x, mode)
+        pca_mean = pca_components = None
+        if pca_dim and pca_dim < x.shape[1]:
+            pca_mean = x.mean(axis=0)
+            _, _, vt = np.linalg.svd(x - pca_mean, full_matrices=False)
+            pca_components = np.ascontiguousarray(vt[:pca_dim], dtype=np.float32)
+            x = (x - pca_mean) @ pca_components.T
+        x = normalize_rows(x)
+
+        scale = None
+        if mode == "float16":
+            data = x.astype(np.float16)
+        elif mode == "int8":
+            # Symmetric per-vector scale: each row uses the full [-127, 127] range
+            scale = (np.abs(x).max(axis=1) / 127.0).astype(np.float32)
+            scale[scale == 0] = 1.0
+            data = np.round(x / scale[:, None]).astype(np.int8)
+        else:
+            data = np.ascontiguousarray(x, dtype=np.float32)
+        return cls(data, mode, scale, pca_mean, pca_components)
+
+    def __len__(self):
+        return self.data.shape[0]
+
+    @property
+    def dim(self):
+        return self.data.shape[1]
+
+    @property
+    def nbytes(self):
+        total = self.data.nbytes
+        for extra in (self.scale, self.pca_mean, self.pca_components):
+            if extra is not None:
+                total += extra.nbytes
+        return total
+
+    def project(self, query):
+        q = np.atleast_2d(np.asarray(query, dtype=np.float32))
+        if self.pca_components is not None:
+            q = (q - self.pca_mean) @ self.pca_components.T
+        return normalize_rows(q)
+
+    def similarities(self, query):
+        """Cosine similarity of a single query vector against every stored row."""
+        q = self.project(query)[0]
+        if self.mode == "float32":
+            return self.data @ q
+
+        # Upcast a bounded block at a time so scoring never materializes a
+        # full float32 copy of the matrix
+        sims = np.empty(len(self), dtype=np.float32)
+        for start in range(0, len(self), CHUNK_ROWS):
+            end = start + CHUNK_ROWS
+            block = self.data[start:end].astype(np.float32) @ q
+            if self.scale is not None:
+                block *= self.scale[start:end]
+            sims[start:end] = block
+        return sims
+
+
+########################### STORAGE REPORT #####################################
+
+def _overlap(a, b):
+    if not a and not b:
+        return 1.0
+    return len(set(a) & set(b)) / max(len(a), len(b))
+
+
+def _configs():
+    for mode in STORAGE_MODES:
+        yield mode, 0
+    for pca_dim in (128, 64):
+        yield "float16", pca_dim
+        yield "int8", pca_dim
+
+
+if __name__ == "__main__":
+    from sympton_retrieval import SymptomRetrievalModel
+
+    retriever = SymptomRetrievalModel(cache_embeddings=True)
+    reference = to_numpy(retriever.model.encode(retriever.unique_symptoms))
+    queries = [s.replace("_", " ") for s in retriever.symptom_vocab_list]
+
+    def rank_symptoms():
+        return [[r["disease"] for r in retriever.get_disease_predictions(q)] for q in queries]
+
+    retriever.symptom_index = CompactEmbeddings.build(reference, "float32", 0)
+    base_bytes = retriever.symptom_index.nbytes
+    base_ranks = rank_symptoms()
+
+    print("\n---------- Embedding Storage Report ------------")
+    print("get_disease_predictions:")
+    for mode, pca_dim in _configs():
+        retriever.symptom_index = CompactEmbeddings.build(reference, mode, pca_dim)
+        ranks = rank_symptoms()
+        top1 = np.mean([a[:1] == b[:1] for a, b in zip(base_ranks, ranks)])
+        topk = np.mean([_overlap(a, b) for a, b in zip(base_ranks, ranks)])
+        saved = 100 * (1 - retriever.symptom_index.nbytes / base_bytes)
+        print(f"  {mode:>7} pca={pca_dim:<3}  {retriever.symptom_index.nbytes/1024:8.1f} KiB "
+              f"(saved {saved:5.1f}%)  top1 agree {top1*100:5.1f}%  top5 overlap {topk*100:5.1f}%")
+
+    from faq_chatbot import FAQChatbot
+    from faq_index import DEFAULT_INDEX_PATH, FAQIndex
+
+    faq = FAQChatbot(DEFAULT_INDEX_PATH)
+    if faq.available:
+        faq_reference = to_numpy(FAQIndex(DEFAULT_INDEX_PATH).embeddings)
+        faq_queries = [faq.questions[i] for i in range(min(500, len(faq.questions)))]
+
+        def rank_faq():
+            return [[r["question"] for r in faq.get_best_match(q, top_k=5)] for q in faq_queries]
+
+        faq.question_index = CompactEmbeddings.build(faq_reference, "float32", 0)
+        faq_base_bytes = faq.question_index.nbytes
+        faq_base = rank_faq()
+
+        print("get_best_match:")
+        for mode, pca_dim in _configs():
+            faq.question_index = CompactEmbeddings.build(faq_reference, mode, pca_dim)
+            ranks = rank_faq()
+            top1 = np.mean([a[:1] == b[:1] for a, b in zip(faq_base, ranks)])
+            topk = np.mean([_overlap(a, b) for a, b in zip(faq_base, ranks)])
+            saved = 100 * (1 - faq.question_index.nbytes / faq_base_bytes)
+            print(f"  {mode:>7} pca={pca_dim:<3}  {faq.question_index.nbytes/1024:8.1f} KiB "
+                  f"(saved {saved:5.1f}%)  top1 agree {top1*100:5.1f}%  top5 overlap {topk*100:5.1f}%")
+    else:
+        print("get_best_match: skipped, no FAQ index (run build_faq_index.py)")
+    print("==========================================\n")
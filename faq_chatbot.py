@@ -1,23 +1,49 @@
-import pandas as pd
-from sentence_transformers import SentenceTransformer
-from sklearn.metrics.pairwise import cosine_similarity
 import numpy as np
+from embedding_backend import get_encoder_key, load_encoder
+from embedding_store import CompactEmbeddings
+from faq_index import DEFAULT_INDEX_PATH, FAQIndex, faq_index_exists
 
 class FAQChatbot:
-    def __init__(self, faq_csv_path="data/faq_dataset.csv"):
-        self.model = SentenceTransformer('all-MiniLM-L6-v2')
-        self.df = pd.read_csv(faq_csv_path).dropna()
-        self.questions = self.df['Question'].tolist()
-        self.answers = self.df['Answer'].tolist()
-        
-        # Precompute question embeddings
-        self.question_embeddings = self.model.encode(
-            self.questions, convert_to_tensor=False
-        )
+    def __init__(self, index_path=DEFAULT_INDEX_PATH):
+        # The index is built offline by build_faq_index.py; opening it only
+        # memory-maps the files. Without one the chatbot still works, it just
+        # never finds an FAQ answer. `unavailable_reason` says why.
+        self.model = load_encoder()
+        self.questions, self.answers, self.question_index = [], [], None
+        self.available, self.unavailable_reason = False, None
+        if not faq_index_exists(index_path):
+            self.unavailable_reason = "no FAQ index found"
+            return
 
-    def get_best_match(self, user_query, top_k=1):
-        user_embedding = self.model.encode([user_query], convert_to_tensor=False)
-        sims = cosine_similarity(user_embedding, self.question_embeddings)[0]
+        index = FAQIndex(index_path)
+        # Vectors from another model or backend would still "match", just
+        # badly, so a stale index is treated like a missing one
+        if index.meta["model"] != get_encoder_key():
+            self.unavailable_reason = (f"the FAQ index was built with {index.meta['model']}, "
+                                       f"but the running encoder is {get_encoder_key()}")
+            return
+        if len(index) == 0:
+            self.unavailable_reason = "the FAQ index is empty"
+            return
+
+        self.available = True
+        self.questions = index.questions
+        self.answers = index.answers
+        self.question_index = CompactEmbeddings.build(index.embeddings, normalized=True)
+
+    def encode_query(self, user_query):
+        # Split out so callers can start the (slow) encode before they know
+        # whether the FAQ answer will actually be needed
+        if not self.available:
+            return None
+        return self.model.encode([user_query], convert_to_tensor=False)
+
+    def get_best_match(self, user_query, top_k=1, query_embedding=None):
+        if not self.available:
+            return []
+        if query_embedding is None:
+            query_embedding = self.encode_query(user_query)
+        sims = self.question_index.similarities(query_embedding)
         top_indices = np.argsort(sims)[::-1][:top_k]
         results = []
         for idx in top_indices:
@@ -26,4 +52,4 @@ class FAQChatbot:
                 "answer": self.answers[idx],
                 "score": sims[idx]
             })
-        return results
\ No newline at end of file
+        return results
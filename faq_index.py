@@ -0,0 +1,115 @@
+# faq_index.py
+#
+# On-disk FAQ index written by build_faq_index.py and opened by FAQChatbot.
+# A directory of plain .npy files so opening it is a handful of memory maps,
+# independent of how many Q&A pairs it holds:
+#
+#   meta.json                     count, dim, model, content_hash, generation
+#   <generation>/embeddings.npy   (n, dim) float32, L2-normalized
+#   <generation>/hashes.npy       (n,) sha1 of each question/answer pair
+#   <generation>/questions.blob.npy / questions.offsets.npy    TextTable
+#   <generation>/answers.blob.npy / answers.offsets.npy        TextTable
+#
+# Every build writes a fresh generation directory and then swaps meta.json to
+# point at it, so a reader opening the index mid-rebuild sees either the old
+# index or the new one, never a mix. The previous generation is kept for
+# readers that read the old meta.json just before the swap.
+
+import hashlib
+import json
+import os
+import shutil
+import uuid
+import numpy as np
+
+from text_table import TextTable
+
+DEFAULT_INDEX_PATH = "data/faq_index"
+INDEX_VERSION = 2
+
+
+def pair_hash(question, answer):
+    return hashlib.sha1(f"{question}\0{answer}".encode("utf-8")).hexdigest()
+
+
+def content_hash(pair_hashes):
+    return hashlib.sha1("".join(pair_hashes).encode("ascii")).hexdigest()
+
+
+def faq_index_exists(path=DEFAULT_INDEX_PATH):
+    return os.path.exists(os.path.join(path, "meta.json"))
+
+
+class FAQIndex:
+    def __init__(self, path=DEFAULT_INDEX_PATH):
+        with open(os.path.join(path, "meta.json")) as f:
+            self.meta = json.load(f)
+
+        # Indexes written before generations existed keep their files at the top level
+        files = os.path.join(path, self.meta.get("generation", ""))
+
+        def load(name):
+            return np.load(os.path.join(files, f"{name}.npy"), mmap_mode="r")
+
+        self.embeddings = load("embeddings")
+        self.hashes = load("hashes")
+        self.questions = TextTable(load("questions.blob"), load("questions.offsets"))
+        self.answers = TextTable(load("answers.blob"), load("answers.offsets"))
+
+    def __len__(self):
+        return self.meta["count"]
+
+
+def _read_generation(path):
+    meta_path = os.path.join(path, "meta.json")
+    if not os.path.exists(meta_path):
+        return None
+    with open(meta_path) as f:
+        return json.load(f).get("generation", "")
+
+
+def write_faq_index(path, questions, answers, hashes, embeddings, model_name):
+    os.makedirs(path, exist_ok=True)
+    previous = _read_generation(path)
+    generation = uuid.uuid4().hex[:12]
+    files = os.path.join(path, generation)
+    os.makedirs(files)
+
+    def save(name, array):
+        np.save(os.path.join(files, f"{name}.npy"), array)
+
+    q_blob, q_offsets = TextTable.encode(questions)
+    a_blob, a_offsets = TextTable.encode(answers)
+    embeddings = np.asarray(embeddings, dtype=np.float32)
+
+    save("embeddings", embeddings)
+    save("hashes", np.array(hashes, dtype="S40"))
+    save("questions.blob", q_blob)
+    save("questions.offsets", q_offsets)
+    save("answers.blob", a_blob)
+    save("answers.offsets", a_offsets)
+
+    meta = {
+        "version": INDEX_VERSION,
+        "count": len(questions),
+        "dim": int(embeddings.shape[1]),
+        "model": model_name,
+        "content_hash": content_hash(hashes),
+        "generation": generation,
+    }
+    # meta.json goes last and is swapped in with a rename: its presence marks
+    # the index as complete and it decides which generation readers open
+    tmp = os.path.join(path, "meta.tmp.json")
+    with open(tmp, "w") as f:
+        json.dump(meta, f, indent=2)
+    os.replace(tmp, os.path.join(path, "meta.json"))
+
+    # Keep the new and the previous generation, drop anything older
+    keep = {generation, previous}
+    for entry in os.listdir(path):
+        entry_path = os.path.join(path, entry)
+        if os.path.isdir(entry_path) and entry not in keep:
+            shutil.rmtree(entry_path, ignore_errors=True)
+        elif entry.endswith(".npy") and previous != "":
+            os.remove(entry_path)  # top-level files from the pre-generation layout
+    return meta
@@ -1,8 +1,37 @@
 # followup.py
 import json
+import threading
+
+FOLLOWUP_PATH = "data/followup_questions.json"
+
+_followup_questions = None
+_load_lock = threading.Lock()
+
+
+def load_followup_questions():
+    # Read on first use rather than at import so importing this module is free
+    global _followup_questions
+    if _followup_questions is None:
+        with _load_lock:
+            if _followup_questions is None:
+                with open(FOLLOWUP_PATH) as f:
+                    _followup_questions = json.load(f)
+    return _followup_questions
+
+
+def use_followup_questions(mapping):
+    # Swap in an already-built mapping (e.g. one attached from shared memory)
+    global _followup_questions
+    with _load_lock:
+        _followup_questions = mapping
+
+
+def __getattr__(name):
+    # Keeps `from followup import followup_questions` working
+    if name == "followup_questions":
+        return load_followup_questions()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
-with open("data/followup_questions.json") as f:
-    followup_questions = json.load(f)
 
 def get_followup_questions(symptom, max_qs=3):
-    return followup_questions.get(symptom.lower(), [])[:max_qs]
+    return load_followup_questions().get(symptom.lower(), [])[:max_qs]
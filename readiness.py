@@ -0,0 +1,120 @@
+# readiness.py
+#
+# Lazily builds the shared model components and records how long each one
+# took. Nothing heavy is imported until a component is first requested, so
+# light paths (followup lookup, severity-only checks) can answer right after
+# process start while warmup() loads the rest.
+#
+# With WELLWISE_SHARED_DATA set, components come from a block published by
+# shared_model_data.py instead of being built from the data files.
+#
+#   python readiness.py      # print per-component startup timings
+
+import os
+import threading
+import time
+
+COMPONENTS = ("followups", "severity_checker", "encoder", "retriever", "faq_model")
+FAQ_INDEX_PATH = "data/faq_index"
+
+_components = {}
+_timings = {}
+# One lock per component so a light component never waits behind a heavy
+# one that another thread (e.g. warmup) is still building
+_locks = {name: threading.Lock() for name in COMPONENTS + ("shared",)}
+_warmup_lock = threading.Lock()
+
+
+def _get_or_build(name, build):
+    if name in _components:
+        return _components[name]
+    with _locks[name]:
+        if name not in _components:
+            start = time.perf_counter()
+            _components[name] = build()
+            _timings[name] = time.perf_counter() - start
+        return _components[name]
+
+
+def _shared_models():
+    def attach():
+        from shared_model_data import attach_models
+        return attach_models(os.environ["WELLWISE_SHARED_DATA"])
+    return _get_or_build("shared", attach)
+
+
+def _build(name):
+    if os.environ.get("WELLWISE_SHARED_DATA") and name in COMPONENTS:
+        return _shared_models()[name]
+    if name == "followups":
+        from followup import load_followup_questions
+        return load_followup_questions()
+    if name == "severity_checker":
+        from symptom_severity_checker import SymptomSeverityChecker
+        return SymptomSeverityChecker()
+    if name == "encoder":
+        from embedding_backend import load_encoder
+        return load_encoder()
+    if name == "retriever":
+        from sympton_retrieval import SymptomRetrievalModel
+        return SymptomRetrievalModel(cache_embeddings=True)
+    if name == "faq_model":
+        from faq_chatbot import FAQChatbot
+        return FAQChatbot(FAQ_INDEX_PATH)
+    raise ValueError(f"Unknown component '{name}', expected one of {COMPONENTS}")
+
+
+def get_component(name):
+    if name not in COMPONENTS:
+        raise ValueError(f"Unknown component '{name}', expected one of {COMPONENTS}")
+    return _get_or_build(name, lambda: _build(name))
+
+
+def _time(label, func):
+    start = time.perf_counter()
+    result = func()
+    _timings[label] = time.perf_counter() - start
+    return result
+
+
+def warmup(components=COMPONENTS):
+    """
+    Load the requested components and push one dummy query through the encoder
+    and the similarity kernels so the first real user query doesn't pay
+    torch's lazy initialization. Returns per-step timings in seconds.
+    """
+    for name in components:
+        get_component(name)
+
+    # Only the dummy query is serialized, so two warmups don't both run it
+    with _warmup_lock:
+        if "encoder" in components and "first_encode" not in _timings:
+            encoder = get_component("encoder")
+            query = _time("first_encode", lambda: encoder.encode(["warmup query"], convert_to_numpy=True))
+            if "retriever" in components:
+                index = get_component("retriever").symptom_index
+                _time("first_symptom_similarity", lambda: index.similarities(query))
+            if "faq_model" in components and get_component("faq_model").available:
+                index = get_component("faq_model").question_index
+                _time("first_faq_similarity", lambda: index.similarities(query))
+        return startup_timings()
+
+
+def is_ready(components=COMPONENTS):
+    return all(name in _components for name in components)
+
+
+def startup_timings():
+    return dict(_timings)
+
+
+if __name__ == "__main__":
+    total_start = time.perf_counter()
+    timings = warmup()
+    total = time.perf_counter() - total_start
+
+    print("\n---------- Startup Timings ------------")
+    for name, seconds in timings.items():
+        print(f"{name:>26}: {seconds*1000:9.1f} ms")
+    print(f"{'total':>26}: {total*1000:9.1f} ms")
+    print("==========================================\n")
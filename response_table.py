@@ -0,0 +1,138 @@
+# response_table.py
+#
+# Everything the per-symptom response path needs, precomputed once and keyed
+# by symptom id: severity level and rank, alert text, the top followup
+# questions and the display fragments chat_cli / app print. At runtime a
+# symptom's response is a single list lookup.
+#
+#   python response_table.py     # write data/symptom_response_table.json
+#
+# If the JSON file is missing, or was built from different versions of the
+# severity CSV / followup JSON, the table is built in memory from those
+# sources instead, so it is an optimization, not a requirement.
+
+import hashlib
+import json
+import os
+import numpy as np
+from followup import FOLLOWUP_PATH
+
+RESPONSE_TABLE_PATH = "data/symptom_response_table.json"
+SEVERITY_SOURCE_PATH = "data/cleaned_symptom_severity.csv"
+MAX_FOLLOWUPS = 3
+
+# Ordered from least to most severe; the index is the rank
+SEVERITY_LEVELS = ("unknown", "mild", "moderate", "severe")
+ALERTS = {
+    "severe": "Seek immediate medical attention.",
+    "moderate": "ℹTake precautions and monitor.",
+    "mild": "ℹTake precautions and monitor.",
+    "unknown": "Unknown severity.",
+}
+
+
+def _render_row(symptom, severity, followups):
+    alert = ALERTS[severity]
+    return {
+        "symptom": symptom,
+        "severity": severity,
+        "rank": SEVERITY_LEVELS.index(severity),
+        "alert": alert,
+        "followups": followups,
+        "severity_cli": f" - {symptom}: Severity={severity.capitalize()} → {alert}",
+        "severity_markdown": f"• {symptom}: {severity.capitalize()}\n  → {alert}",
+        "followup_cli_lines": [f"\nFollow-up questions for the newly mentioned symptom '{symptom}':"]
+                              + [f"  {i}. {q}" for i, q in enumerate(followups, 1)],
+        "followup_markdown_lines": [f"**Follow-up questions for '{symptom}':**"]
+                                   + [f"{i}. {q}" for i, q in enumerate(followups, 1)],
+    }
+
+
+def build_response_table(severity_map, followups, max_qs=MAX_FOLLOWUPS):
+    """Rows for every symptom known to either source, sorted by name; the row index is the symptom id."""
+    symptoms = sorted(set(severity_map) | {s.lower() for s in followups})
+    followups = {s.lower(): qs for s, qs in followups.items()}
+    rows = []
+    for symptom in symptoms:
+        severity = severity_map.get(symptom, "unknown")
+        if severity not in ALERTS:
+            severity = "unknown"
+        rows.append(_render_row(symptom, severity, list(followups.get(symptom, []))[:max_qs]))
+    return rows
+
+
+def source_hash(source_paths=(SEVERITY_SOURCE_PATH, FOLLOWUP_PATH)):
+    digest = hashlib.sha1()
+    for path in source_paths:
+        with open(path, "rb") as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+
+class ResponseTable:
+    def __init__(self, rows):
+        self.rows = rows
+        self.ids = {row["symptom"]: i for i, row in enumerate(rows)}
+        self.severity_rank = np.array([row["rank"] for row in rows], dtype=np.int8)
+
+    @classmethod
+    def load(cls, path=RESPONSE_TABLE_PATH, severity_map=None, followups=None,
+             source_paths=(SEVERITY_SOURCE_PATH, FOLLOWUP_PATH)):
+        if path and os.path.exists(path):
+            with open(path) as f:
+                table = json.load(f)
+            # Only trust the file if it was built from the current sources
+            if table.get("source_hash") == source_hash(source_paths):
+                return cls(table["rows"])
+        if followups is None:
+            from followup import load_followup_questions
+            followups = load_followup_questions()
+        return cls(build_response_table(severity_map or {}, followups))
+
+    def __len__(self):
+        return len(self.rows)
+
+    def symptom_id(self, symptom):
+        return self.ids.get(symptom.lower())
+
+    def symptom_ids(self, symptoms):
+        return [i for i in (self.symptom_id(s) for s in symptoms) if i is not None]
+
+    def lookup(self, symptom):
+        symptom_id = self.symptom_id(symptom)
+        if symptom_id is None:
+            return _render_row(symptom, "unknown", [])
+        # The table is shared by every session in the process; callers get a
+        # copy (lists included) so editing a result can't change the table
+        row = self.rows[symptom_id]
+        return {key: list(value) if isinstance(value, list) else value for key, value in row.items()}
+
+    def worst_severity(self, symptom_ids):
+        ids = np.asarray(symptom_ids, dtype=np.int64)
+        if ids.size == 0:
+            rank = 0
+            worst = []
+        else:
+            ranks = self.severity_rank[ids]
+            rank = int(ranks.max())
+            worst = [self.rows[i]["symptom"] for i in ids[ranks == rank]]
+        severity = SEVERITY_LEVELS[rank]
+        return {"severity": severity, "alert": ALERTS[severity], "symptoms": worst}
+
+
+def write_response_table(rows, path=RESPONSE_TABLE_PATH,
+                         source_paths=(SEVERITY_SOURCE_PATH, FOLLOWUP_PATH)):
+    table = {"source_hash": source_hash(source_paths), "severity_levels": SEVERITY_LEVELS, "rows": rows}
+    with open(path, "w") as f:
+        json.dump(table, f, indent=2, ensure_ascii=False)
+
+
+if __name__ == "__main__":
+    from followup import load_followup_questions
+    from symptom_severity_checker import SymptomSeverityChecker
+
+    # Always rebuild from the sources, never from a stale table
+    checker = SymptomSeverityChecker(SEVERITY_SOURCE_PATH, response_table_path=None)
+    rows = build_response_table(checker.severity_map, load_followup_questions())
+    write_response_table(rows)
+    print(f"✅ Saved {RESPONSE_TABLE_PATH} with {len(rows)} symptoms.")
@@ -0,0 +1,238 @@
+# shared_model_data.py
+#
+# Build the model tables once in a parent process and let worker processes
+# attach to them read-only through multiprocessing.shared_memory. Everything
+# is flattened into numpy buffers inside a single block:
+#   - embedding matrices (in whatever CompactEmbeddings storage mode is active)
+#   - string tables (vocabulary, disease names, severity levels, followups,
+#     FAQ questions/answers) as TextTable blobs + offsets
+#   - symptom -> diseases as CSR-style offsets + disease ids
+# Workers only build a small key -> row dict per table; strings are decoded on
+# access, so per-worker memory is roughly the interpreter plus model weights.
+#
+# Parent:   python shared_model_data.py [name]     (prints the block name)
+# Workers:  WELLWISE_SHARED_DATA=<name> streamlit run app.py
+
+import json
+import os
+import numpy as np
+from multiprocessing import shared_memory
+
+from embedding_store import CompactEmbeddings
+from text_table import TextTable, SharedMapping
+
+DEFAULT_NAME = "wellwise_model_data"
+ALIGNMENT = 64
+HEADER_BYTES = 8   # little-endian uint64 length of the JSON manifest
+
+
+def _align(n):
+    return (n + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+
+
+def _add_text(arrays, key, strings):
+    arrays[f"{key}/blob"], arrays[f"{key}/offsets"] = TextTable.encode(strings)
+
+
+def _add_embeddings(arrays, meta, key, index):
+    meta[f"{key}/mode"] = index.mode
+    for part in ("data", "scale", "pca_mean", "pca_components"):
+        value = getattr(index, part)
+        if value is not None:
+            arrays[f"{key}/{part}"] = np.ascontiguousarray(value)
+
+
+def _collect(retriever, severity_checker, followups, faq_model=None):
+    from embedding_backend import get_encoder_key
+
+    # Which model and backend produced the vectors; workers refuse to score
+    # their queries against another encoder's embedding space
+    arrays, meta = {}, {"encoder": get_encoder_key()}
+
+    _add_text(arrays, "vocab", retriever.symptom_vocab_list)
+    _add_text(arrays, "unique_symptoms", retriever.unique_symptoms)
+    _add_embeddings(arrays, meta, "symptom_index", retriever.symptom_index)
+
+    diseases = sorted({d for ds in retriever.symptom_to_disease.values() for d in ds})
+    disease_ids = {d: i for i, d in enumerate(diseases)}
+    groups = [retriever.symptom_to_disease.get(s, []) for s in retriever.unique_symptoms]
+    _add_text(arrays, "diseases", diseases)
+    arrays["symptom_disease/offsets"] = np.cumsum([0] + [len(g) for g in groups]).astype(np.int64)
+    arrays["symptom_disease/ids"] = np.array([disease_ids[d] for g in groups for d in g], dtype=np.int32)
+
+    severity_keys = list(severity_checker.severity_map)
+    _add_text(arrays, "severity/keys", severity_keys)
+    _add_text(arrays, "severity/levels", [severity_checker.severity_map[k] for k in severity_keys])
+    _add_text(arrays, "severity/symptoms", severity_checker.symptoms)
+
+    followup_keys = list(followups)
+    _add_text(arrays, "followups/keys", followup_keys)
+    _add_text(arrays, "followups/questions", [q for k in followup_keys for q in followups[k]])
+    arrays["followups/offsets"] = np.cumsum([0] + [len(followups[k]) for k in followup_keys]).astype(np.int64)
+
+    if faq_model is not None and faq_model.available:
+        _add_embeddings(arrays, meta, "faq_index", faq_model.question_index)
+        _add_text(arrays, "faq/questions", faq_model.questions)
+        _add_text(arrays, "faq/answers", faq_model.answers)
+    return arrays, meta
+
+
+def publish(retriever, severity_checker, followups, faq_model=None, name=DEFAULT_NAME):
+    """
+    Copy the tables into a new shared memory block. The caller owns the
+    returned SharedMemory and must keep it open while workers run, then
+    close() and unlink() it.
+    """
+    arrays, meta = _collect(retriever, severity_checker, followups, faq_model)
+
+    entries, offset = {}, 0
+    for key, arr in arrays.items():
+        offset = _align(offset)
+        entries[key] = {"offset": offset, "dtype": arr.dtype.str, "shape": list(arr.shape)}
+        offset += arr.nbytes
+    manifest = json.dumps({"arrays": entries, "meta": meta}).encode("utf-8")
+    data_start = _align(HEADER_BYTES + len(manifest))
+
+    shm = shared_memory.SharedMemory(name=name, create=True, size=max(data_start + offset, 1))
+    shm.buf[:HEADER_BYTES] = len(manifest).to_bytes(HEADER_BYTES, "little")
+    shm.buf[HEADER_BYTES:HEADER_BYTES + len(manifest)] = manifest
+    for key, arr in arrays.items():
+        entry = entries[key]
+        view = np.ndarray(arr.shape, dtype=arr.dtype, buffer=shm.buf, offset=data_start + entry["offset"])
+        view[...] = arr
+    return shm
+
+
+class SharedModelData:
+    def __init__(self, name=DEFAULT_NAME):
+        try:
+            self.shm = shared_memory.SharedMemory(name=name, track=False)
+        except TypeError:
+            # Python < 3.13 has no track=False; without unregistering, the
+            # resource tracker would unlink the block when this worker exits
+            from multiprocessing import resource_tracker
+            self.shm = shared_memory.SharedMemory(name=name)
+            resource_tracker.unregister(self.shm._name, "shared_memory")
+
+        manifest_len = int.from_bytes(bytes(self.shm.buf[:HEADER_BYTES]), "little")
+        manifest = json.loads(bytes(self.shm.buf[HEADER_BYTES:HEADER_BYTES + manifest_len]))
+        data_start = _align(HEADER_BYTES + manifest_len)
+
+        self.meta = manifest["meta"]
+        self.arrays = {}
+        for key, entry in manifest["arrays"].items():
+            view = np.ndarray(tuple(entry["shape"]), dtype=np.dtype(entry["dtype"]),
+                              buffer=self.shm.buf, offset=data_start + entry["offset"])
+            view.flags.writeable = False
+            self.arrays[key] = view
+
+    def has(self, key):
+        return f"{key}/blob" in self.arrays or f"{key}/data" in self.arrays
+
+    def text(self, key):
+        return TextTable(self.arrays[f"{key}/blob"], self.arrays[f"{key}/offsets"])
+
+    def embeddings(self, key):
+        return CompactEmbeddings(
+            self.arrays[f"{key}/data"],
+            self.meta[f"{key}/mode"],
+            self.arrays.get(f"{key}/scale"),
+            self.arrays.get(f"{key}/pca_mean"),
+            self.arrays.get(f"{key}/pca_components"),
+        )
+
+
+def attach_models(name=DEFAULT_NAME):
+    """
+    Attach to a published block and return ready-to-use components backed by
+    it. The model classes are created with __new__ because their constructors
+    read the CSV/JSON sources this mode exists to avoid.
+    """
+    from embedding_backend import get_encoder_key, load_encoder
+    from followup import use_followup_questions
+    from sympton_retrieval import SymptomRetrievalModel
+    from symptom_severity_checker import SymptomSeverityChecker
+    from faq_chatbot import FAQChatbot
+    from response_table import ResponseTable
+
+    shared = SharedModelData(name)
+    published_with = shared.meta.get("encoder")
+    if published_with != get_encoder_key():
+        shared.shm.close()
+        raise ValueError(f"Shared model data '{name}' was published with encoder {published_with}, "
+                         f"but this worker uses {get_encoder_key()}. Start workers with the same "
+                         "WELLWISE_MODEL_PATH / WELLWISE_ENCODER_BACKEND as the publisher.")
+    encoder = load_encoder()
+
+    retriever = SymptomRetrievalModel.__new__(SymptomRetrievalModel)
+    retriever.model = encoder
+    retriever.cache_embeddings = False
+    # rapidfuzz wants a real list; the vocabulary is small
+    retriever.symptom_vocab_list = list(shared.text("vocab"))
+    retriever.unique_symptoms = shared.text("unique_symptoms")
+    retriever.symptom_index = shared.embeddings("symptom_index")
+    retriever.symptom_to_disease = SharedMapping(
+        retriever.unique_symptoms, shared.text("diseases"),
+        shared.arrays["symptom_disease/offsets"], shared.arrays["symptom_disease/ids"],
+    )
+
+    severity_checker = SymptomSeverityChecker.__new__(SymptomSeverityChecker)
+    severity_checker.symptoms = list(shared.text("severity/symptoms"))
+    severity_checker.symptom_vocab_list = severity_checker.symptoms
+    severity_checker.severity_map = SharedMapping(shared.text("severity/keys"), shared.text("severity/levels"))
+
+    followups = SharedMapping(
+        shared.text("followups/keys"), shared.text("followups/questions"), shared.arrays["followups/offsets"]
+    )
+    use_followup_questions(followups)
+    # path=None: build from the attached mappings, never from a JSON file on
+    # disk that could disagree with what the parent published
+    severity_checker.responses = ResponseTable.load(
+        path=None, severity_map=severity_checker.severity_map, followups=followups
+    )
+
+    faq_model = FAQChatbot.__new__(FAQChatbot)
+    faq_model.model = encoder
+    faq_model.available = shared.has("faq_index")
+    # The parent only publishes an index its own FAQChatbot accepted
+    faq_model.unavailable_reason = None if faq_model.available else "no FAQ index was published"
+    faq_model.questions, faq_model.answers, faq_model.question_index = [], [], None
+    if faq_model.available:
+        faq_model.question_index = shared.embeddings("faq_index")
+        faq_model.questions = shared.text("faq/questions")
+        faq_model.answers = shared.text("faq/answers")
+
+    return {
+        "shared": shared,   # keeps the mapping alive
+        "encoder": encoder,
+        "retriever": retriever,
+        "severity_checker": severity_checker,
+        "followups": followups,
+        "faq_model": faq_model,
+    }
+
+
+if __name__ == "__main__":
+    import signal
+    import sys
+    from readiness import get_component
+
+    # The publisher always builds from the data files, never attaches
+    os.environ.pop("WELLWISE_SHARED_DATA", None)
+    name = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_NAME
+    shm = publish(
+        get_component("retriever"),
+        get_component("severity_checker"),
+        get_component("followups"),
+        get_component("faq_model"),
+        name=name,
+    )
+    print(f"Published {shm.size / 1024:.1f} KiB of model data as '{name}'.")
+    print(f"Start workers with WELLWISE_SHARED_DATA={name}. Ctrl-C to unpublish.")
+    try:
+        signal.pause()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        shm.close()
+        shm.unlink()
@@ -1,34 +1,36 @@
 ##Install requirements
 ##!pip install rapidfuzz
 
-import pandas as pd
-from rapidfuzz import process, fuzz
-import re
+import csv
 from symptom_utils import extract_symptoms_from_sentence
+from followup import FOLLOWUP_PATH
+from response_table import RESPONSE_TABLE_PATH, ResponseTable
 
 class SymptomSeverityChecker:
-    def __init__(self, severity_data_path="data/cleaned_symptom_severity.csv"):
-        self.df = pd.read_csv(severity_data_path)
-        self.symptoms = self.df['Symptom'].str.lower().tolist()
-        self.severity_map = dict(zip(self.df['Symptom'].str.lower(), self.df['SeverityLevel'].str.lower()))
+    def __init__(self, severity_data_path="data/cleaned_symptom_severity.csv", response_table_path=RESPONSE_TABLE_PATH):
+        # Plain csv instead of pandas: this is a two-column file and the
+        # severity-only path shouldn't pay for importing pandas
+        with open(severity_data_path, newline="") as f:
+            rows = list(csv.DictReader(f))
+        self.symptoms = [row['Symptom'].lower() for row in rows]
+        self.severity_map = {row['Symptom'].lower(): row['SeverityLevel'].lower() for row in rows}
         self.symptom_vocab_list = self.symptoms
+        # Severity, alert, followups and display text per symptom id
+        self.responses = ResponseTable.load(
+            response_table_path, self.severity_map,
+            source_paths=(severity_data_path, FOLLOWUP_PATH)
+        )
 
     def classify_severity(self, user_input):
         symptoms = extract_symptoms_from_sentence(user_input, self.symptom_vocab_list)
         if not symptoms:
             return []
 
-        results = []
-        for symptom in symptoms:
-            severity = self.severity_map.get(symptom, "unknown")
-            results.append({
-                "symptom": symptom,
-                "severity": severity,
-                "alert": "Seek immediate medical attention." if severity == "severe"
-                         else "ℹTake precautions and monitor."
-                         if severity in ["moderate", "mild"] else "Unknown severity."
-            })
-        return results
+        return [self.responses.lookup(symptom) for symptom in symptoms]
+
+    def classify_severity_many(self, symptom_ids):
+        # Worst severity across a whole session in one vectorized lookup
+        return self.responses.worst_severity(symptom_ids)
 
 ################################################################
 
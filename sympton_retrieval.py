@@ -1,35 +1,58 @@
 # symptom_retrieval.py
 
-import pandas as pd
-from sentence_transformers import SentenceTransformer
-from sklearn.metrics.pairwise import cosine_similarity
 import numpy as np
+from embedding_backend import load_encoder, get_backend_name, get_encoder_key, texts_digest
+from embedding_store import CompactEmbeddings, to_numpy
 import os
 import pickle
-from rapidfuzz import process, fuzz
-import re
 from symptom_utils import extract_symptoms_from_sentence
 from followup import get_followup_questions
 
+SYMPTOM_CACHE_TEMPLATE = "data/symptom_embeddings_{backend}.pkl"
+
+
+def symptom_cache_path(backend=None):
+    # One cache per encoder backend so int8/onnx queries are never scored
+    # against vectors from a different model
+    return SYMPTOM_CACHE_TEMPLATE.format(backend=backend or get_backend_name())
+
 
 class SymptomRetrievalModel:
     def __init__(self, data_path="data/cleaned_symptom_disease.csv", symptom_vocab_path="data/symptom_vocabulary.csv", cache_embeddings=True):
+        import pandas as pd
+
         self.df = pd.read_csv(data_path).drop_duplicates(subset=['Symptom', 'Disease'])
         self.symptom_vocab_list = pd.read_csv(symptom_vocab_path)['Symptom'].tolist()
-        self.model = SentenceTransformer('all-MiniLM-L6-v2')
-        self.cache_path = "data/symptom_embeddings.pkl"
+        self.model = load_encoder()
+        self.cache_path = symptom_cache_path()
         self.cache_embeddings = cache_embeddings
 
         # Create list of unique symptoms
         self.unique_symptoms = self.df['Symptom'].unique().tolist()
 
         # Load or compute embeddings
+        # The cache is a plain dict holding a float32 numpy array, so loading it
+        # never goes through torch (or whatever device the tensor was made on)
+        symptom_embeddings = None
+        encoder_key = get_encoder_key()
+        symptoms_digest = texts_digest(self.unique_symptoms)
         if self.cache_embeddings and os.path.exists(self.cache_path):
-            self.symptom_embeddings = self.load_pickle(self.cache_path)
-        else:
-            self.symptom_embeddings = self.model.encode(self.unique_symptoms, convert_to_tensor=True)
+            cached = self.load_pickle(self.cache_path)
+            # Stale cache (other model, or vocabulary edited/reordered): re-encode
+            if (isinstance(cached, dict) and cached.get("model") == encoder_key
+                    and cached.get("texts") == symptoms_digest):
+                symptom_embeddings = cached["embeddings"]
+
+        if symptom_embeddings is None:
+            # For large vocabularies prefer `python build_embeddings.py symptoms`
+            symptom_embeddings = to_numpy(self.model.encode(self.unique_symptoms, convert_to_numpy=True))
             if self.cache_embeddings:
-                self.save_pickle(self.symptom_embeddings, self.cache_path)
+                self.save_pickle({"model": encoder_key, "texts": symptoms_digest,
+                                  "embeddings": symptom_embeddings}, self.cache_path)
+
+        # Normalized, possibly float16/int8/PCA-reduced copy; the full fp32
+        # matrix is not kept around
+        self.symptom_index = CompactEmbeddings.build(symptom_embeddings)
 
         # Mapping from symptom to associated diseases
         self.symptom_to_disease = self.df.groupby("Symptom")["Disease"].apply(list).to_dict()
@@ -48,11 +71,11 @@ class SymptomRetrievalModel:
             return []  # no valid symptoms after spell correction
 
         # Embed and average valid user symptoms
-        user_embeddings = self.model.encode(user_symptoms, convert_to_tensor=True)
-        avg_embedding = np.mean(user_embeddings.cpu().numpy(), axis=0).reshape(1, -1)
+        user_embeddings = self.model.encode(user_symptoms, convert_to_numpy=True)
+        avg_embedding = np.mean(user_embeddings, axis=0).reshape(1, -1)
 
         # Compute cosine similarity
-        similarities = cosine_similarity(avg_embedding, self.symptom_embeddings.cpu().numpy())[0]
+        similarities = self.symptom_index.similarities(avg_embedding)
         top_indices = np.argsort(similarities)[::-1][:top_k]
 
         matched_symptoms = [self.unique_symptoms[i] for i in top_indices]
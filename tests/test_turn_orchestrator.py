@@ -0,0 +1,38 @@
+import asyncio
+import os
+import time
+
+import turn_orchestrator
+
+
+class StubRetriever:
+    symptom_vocab_list = ["headache", "fever"]
+
+
+class StubFAQ:
+    def encode_query(self, user_query):
+        time.sleep(0.01)
+        return [0.0]
+
+    def get_best_match(self, user_query, top_k=1, query_embedding=None):
+        return [{"question": "q", "answer": "a", "score": 0.9}]
+
+
+def test_burst_of_turns_does_not_deadlock():
+    # More turns than the loop's default executor has threads, so every
+    # thread would be taken if turns waited for a slot inside one
+    turns = min(32, (os.cpu_count() or 1) + 4) + 8
+    faq = StubFAQ()
+
+    async def burst():
+        return await asyncio.gather(*[
+            turn_orchestrator.orchestrate_turn("hello there", set(), set(), StubRetriever(), None, faq)
+            for _ in range(turns)
+        ])
+
+    future = asyncio.run_coroutine_threadsafe(burst(), turn_orchestrator._get_loop())
+    results = future.result(timeout=20)
+
+    assert [r["faq_answer"] for r in results] == ["a"] * turns
+    slots = turn_orchestrator._inference_slots
+    assert slots._value == int(os.environ.get("WELLWISE_MAX_INFERENCE", "4"))
@@ -0,0 +1,87 @@
+# text_table.py
+#
+# Read-only string tables backed by flat numpy buffers, so they can live in
+# shared memory or a memory-mapped file without being unpickled into Python
+# strings up front. Strings are decoded one at a time on access.
+
+import numpy as np
+
+
+class TextTable:
+    """A list of strings stored as one utf-8 blob plus (n + 1) offsets."""
+
+    def __init__(self, blob, offsets):
+        self.blob = blob          # uint8 array
+        self.offsets = offsets    # int64 array, offsets[i]:offsets[i+1] is row i
+
+    @staticmethod
+    def encode(strings):
+        encoded = [str(s).encode("utf-8") for s in strings]
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        offsets[1:] = np.cumsum([len(e) for e in encoded], dtype=np.int64)
+        blob = np.frombuffer(b"".join(encoded), dtype=np.uint8).copy()
+        return blob, offsets
+
+    @classmethod
+    def from_strings(cls, strings):
+        return cls(*cls.encode(strings))
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i):
+        i = int(i)
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError("TextTable index out of range")
+        return self.blob[self.offsets[i]:self.offsets[i + 1]].tobytes().decode("utf-8")
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+
+class SharedMapping:
+    """
+    Dict-like read-only view over TextTables. With `offsets`, each key maps to
+    a list: values[offsets[i]:offsets[i+1]], or values[value_ids[...]] when the
+    values are a deduplicated table. Without, each key maps to values[i].
+    Only the small key -> row index is a real dict.
+    """
+
+    def __init__(self, keys, values, offsets=None, value_ids=None):
+        self._rows = {k: i for i, k in enumerate(keys)}
+        self.values = values
+        self.offsets = offsets
+        self.value_ids = value_ids
+
+    def _value(self, row):
+        if self.offsets is None:
+            return self.values[row]
+        start, end = self.offsets[row], self.offsets[row + 1]
+        ids = self.value_ids[start:end] if self.value_ids is not None else range(start, end)
+        return [self.values[j] for j in ids]
+
+    def get(self, key, default=None):
+        row = self._rows.get(key)
+        return default if row is None else self._value(row)
+
+    def __getitem__(self, key):
+        return self._value(self._rows[key])
+
+    def __contains__(self, key):
+        return key in self._rows
+
+    def __len__(self):
+        return len(self._rows)
+
+    def __iter__(self):
+        return iter(self._rows)
+
+    def keys(self):
+        return self._rows.keys()
+
+    def items(self):
+        for key, row in self._rows.items():
+            yield key, self._value(row)
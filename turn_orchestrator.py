@@ -0,0 +1,172 @@
+# turn_orchestrator.py
+#
+# Runs one chat turn with the independent pieces of work overlapped instead of
+# one after another. The model calls are blocking (torch / rapidfuzz), so each
+# one is pushed onto a worker thread with asyncio.to_thread and the event loop
+# only does the scheduling.
+#
+# The shared models are read-only after loading, so calls from different
+# sessions can overlap. WELLWISE_MAX_INFERENCE bounds how many model calls run
+# at once across the whole process (default 4); all turns share the one loop
+# below, which is what makes that bound process-wide.
+#
+# Turns run on one long-lived event loop in a background thread. asyncio.run
+# per turn would shut down the default executor on exit and so wait for any
+# dropped speculative work before returning.
+
+import asyncio
+import os
+import threading
+from symptom_utils import extract_symptoms_from_sentence
+
+QUESTION_PREFIXES = ("what", "how", "can", "should", "is", "do", "does", "will", "could")
+FAQ_SCORE_THRESHOLD = 0.5
+
+# An asyncio semaphore on the orchestrator loop, not a threading one: work
+# waits for a slot on the loop and only gets an executor thread once it holds
+# one. Blocking executor threads on a slot can deadlock a burst of turns when
+# the slot holders are themselves queued for a thread.
+_inference_slots = asyncio.Semaphore(int(os.environ.get("WELLWISE_MAX_INFERENCE", "4")))
+
+
+async def _run(func, *args):
+    async with _inference_slots:
+        return await asyncio.to_thread(func, *args)
+
+
+class _Speculation:
+    """
+    Work started before we know it's needed. It only runs if an inference
+    slot is free when it gets scheduled (never queue speculative work behind
+    real work), and it rechecks the cancel flag once it gets a thread.
+    """
+
+    def __init__(self, func, *args):
+        self.cancelled = threading.Event()
+        self.task = None
+        if not _inference_slots.locked():
+            self.task = asyncio.create_task(self._speculate(func, *args))
+
+    async def _speculate(self, func, *args):
+        # Checked again: real work may have taken the last slot since
+        # __init__. Acquiring an unlocked semaphore doesn't yield, so nothing
+        # can take it in between.
+        if self.cancelled.is_set() or _inference_slots.locked():
+            return None
+        async with _inference_slots:
+            return await asyncio.to_thread(self._call, func, *args)
+
+    def _call(self, func, *args):
+        return None if self.cancelled.is_set() else func(*args)
+
+    async def result(self):
+        return None if self.task is None else await self.task
+
+    async def cancel(self):
+        # A thread that already started can't be interrupted, and cancelling
+        # the task would free its slot while that thread still runs. So the
+        # task isn't awaited or cancelled: a not-yet-started job becomes a
+        # no-op and any result or error is dropped.
+        self.cancelled.set()
+        if self.task is not None:
+            self.task.add_done_callback(_discard_result)
+
+
+def _discard_result(task):
+    if not task.cancelled():
+        task.exception()  # mark retrieved so asyncio doesn't log it
+
+
+_loop = None
+_loop_lock = threading.Lock()
+
+
+def _get_loop():
+    global _loop
+    with _loop_lock:
+        if _loop is None:
+            _loop = asyncio.new_event_loop()
+            threading.Thread(target=_loop.run_forever, name="turn-orchestrator", daemon=True).start()
+        return _loop
+
+
+def _run_on_loop(coro):
+    return asyncio.run_coroutine_threadsafe(coro, _get_loop()).result()
+
+
+def looks_like_question(text: str):
+    text = text.lower()
+    return "?" in text or text.startswith(QUESTION_PREFIXES)
+
+
+async def analyze_symptoms(session_symptoms, retriever, severity_checker, followup_symptoms=()):
+    symptom_list_str = ", ".join(session_symptoms)
+    disease_results, severity_results = await asyncio.gather(
+        _run(retriever.get_disease_predictions, symptom_list_str),
+        _run(severity_checker.classify_severity, symptom_list_str),
+    )
+
+    # Followups and the session-wide severity are precomputed table lookups,
+    # not worth a thread hop
+    responses = severity_checker.responses
+    followup_rows = {s: responses.lookup(s) for s in followup_symptoms}
+    overall_severity = severity_checker.classify_severity_many(
+        responses.symptom_ids(r["symptom"] for r in severity_results)
+    )
+    return {
+        "disease_results": disease_results,
+        "severity_results": severity_results,
+        "overall_severity": overall_severity,
+        "followups": {s: row["followups"] for s, row in followup_rows.items()},
+        "followup_rows": followup_rows,
+    }
+
+
+async def orchestrate_turn(user_input, session_symptoms, asked_followups_for,
+                           retriever, severity_checker, faq_model):
+    """
+    Process one user message. Returns a dict whose "kind" is one of:
+      - "symptoms":  new symptoms were found; includes predictions, severity
+                     and followups for the symptoms not asked about yet
+      - "faq":       no symptoms, the text reads like a question
+      - "ambiguous": no symptoms and not obviously a question; the FAQ match
+                     is still included so a later "question" choice is free
+    session_symptoms / asked_followups_for are not modified.
+    """
+    # Start the FAQ encode speculatively: it's the slow part of the question
+    # path and doesn't depend on the extraction result.
+    faq_encode = _Speculation(faq_model.encode_query, user_input)
+
+    try:
+        new_symptoms = set(await _run(
+            extract_symptoms_from_sentence, user_input, retriever.symptom_vocab_list
+        ))
+    except BaseException:
+        await faq_encode.cancel()
+        raise
+
+    if new_symptoms:
+        await faq_encode.cancel()
+        all_symptoms = set(session_symptoms) | new_symptoms
+        unasked = [s for s in new_symptoms if s not in asked_followups_for]
+        analysis = await analyze_symptoms(all_symptoms, retriever, severity_checker, unasked)
+        return {"kind": "symptoms", "new_symptoms": new_symptoms,
+                "session_symptoms": all_symptoms, **analysis}
+
+    # None when speculation was skipped; get_best_match then encodes itself
+    query_embedding = await faq_encode.result()
+    faq_results = await _run(faq_model.get_best_match, user_input, 1, query_embedding)
+    answer = None
+    if faq_results and faq_results[0]["score"] > FAQ_SCORE_THRESHOLD:
+        answer = faq_results[0]["answer"]
+
+    kind = "faq" if looks_like_question(user_input) else "ambiguous"
+    return {"kind": kind, "faq_results": faq_results, "faq_answer": answer}
+
+
+def run_turn(*args, **kwargs):
+    return _run_on_loop(orchestrate_turn(*args, **kwargs))
+
+
+def run_analysis(*args, **kwargs):
+    return _run_on_loop(analyze_symptoms(*args, **kwargs))